@@ -1,11 +1,29 @@
 """Base analyzer interface and data models."""
 
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
+# Detector keyword sets, frozen at module level so they are built once
+_ERROR_INDICATORS = (
+    'error:', 'exception:', 'traceback',
+    'failed', 'cannot', 'undefined',
+    'null pointer', 'segmentation fault'
+)
+
+_APOLOGY_PHRASES = (
+    'i apologize', 'sorry', 'my apologies',
+    'i was wrong', 'let me correct'
+)
+
+# Compiled once at import: a single C-level scan over the content replaces
+# one Python-level substring search per indicator.
+_ERROR_RE = re.compile('|'.join(map(re.escape, _ERROR_INDICATORS)))
+_APOLOGY_RE = re.compile('|'.join(map(re.escape, _APOLOGY_PHRASES)))
+
 
 class MessageRole(Enum):
     """Role of the message sender."""
@@ -14,18 +32,29 @@ class MessageRole(Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Message:
     """Represents a single message in a conversation."""
     role: MessageRole
     content: str
     timestamp: Optional[datetime] = None
-    
+    # Backing slot for content_lower; cached_property needs a __dict__,
+    # which slots removes
+    _content_lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content, computed once and reused by the detectors."""
+        if self._content_lower is None:
+            # object.__setattr__: filling the cache slot on a frozen dataclass
+            object.__setattr__(self, '_content_lower', self.content.lower())
+        return self._content_lower
+
     def __str__(self) -> str:
         return f"{self.role.value}: {self.content[:100]}..."
 
 
-@dataclass
+@dataclass(slots=True)
 class LoopPattern:
     """Detected loop or problematic pattern."""
     pattern_type: str  # "repetitive_error", "circular_logic", "apology_cascade", etc.
@@ -38,7 +67,7 @@ class LoopPattern:
         return f"{self.pattern_type} (x{self.occurrences}): {self.description}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Analysis:
     """Results of conversation analysis."""
     goal: str  # Extracted original goal
@@ -83,39 +112,17 @@ class BaseAnalyzer(ABC):
         """
         pass
     
+    # Fenced code blocks in one C-level scan instead of a per-line Python loop
+    _CODE_BLOCK_RE = re.compile(r'(?ms)^[ \t]*```[^\n]*\n(.*?)^[ \t]*```')
+
     def _extract_code_blocks(self, content: str) -> List[str]:
         """Extract code blocks from message content."""
-        code_blocks = []
-        lines = content.split('\n')
-        in_code_block = False
-        current_block = []
-        
-        for line in lines:
-            if line.strip().startswith('```'):
-                if in_code_block:
-                    code_blocks.append('\n'.join(current_block))
-                    current_block = []
-                in_code_block = not in_code_block
-            elif in_code_block:
-                current_block.append(line)
-        
-        return code_blocks
+        return [m.group(1).rstrip('\n') for m in self._CODE_BLOCK_RE.finditer(content)]
     
     def _is_error_message(self, content: str) -> bool:
         """Check if message contains an error."""
-        error_indicators = [
-            'error:', 'exception:', 'traceback',
-            'failed', 'cannot', 'undefined',
-            'null pointer', 'segmentation fault'
-        ]
-        content_lower = content.lower()
-        return any(indicator in content_lower for indicator in error_indicators)
-    
+        return _ERROR_RE.search(content.lower()) is not None
+
     def _is_apology(self, content: str) -> bool:
         """Check if message is an apology."""
-        apology_phrases = [
-            'i apologize', 'sorry', 'my apologies',
-            'i was wrong', 'let me correct'
-        ]
-        content_lower = content.lower()
-        return any(phrase in content_lower for phrase in apology_phrases)
+        return _APOLOGY_RE.search(content.lower()) is not None
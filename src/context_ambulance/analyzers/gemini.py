@@ -1,34 +1,89 @@
 """Gemini-based conversation analyzer."""
 
+import asyncio
+import hashlib
+import io
 import os
+import re
+import time
+from pathlib import Path
 from typing import List, Optional
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+from . import Analysis, BaseAnalyzer, LoopPattern, Message, MessageRole
 
-from . import Analysis, BaseAnalyzer, LoopPattern, Message
+
+class ResponseCache:
+    """
+    Small file-backed cache for raw Gemini response text.
+
+    LLM calls dominate wall time and cost, and identical conversations
+    (CI re-runs, repeated rescues of the same transcript) produce identical
+    prompts. One file per key, keyed by prompt hash.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: Optional[float] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            cache_dir: Directory for cached responses
+                (default: ~/.cache/context-ambulance/gemini)
+            ttl: Seconds before an entry expires (default: never)
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / ".cache" / "context-ambulance" / "gemini"
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response text for key, or None on miss/expiry."""
+        path = self.cache_dir / f"{key}.txt"
+        try:
+            if self.ttl is not None and time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def set(self, key: str, response_text: str):
+        """Store response text under key."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / f"{key}.txt").write_text(response_text, encoding='utf-8')
 
 
 class GeminiAnalyzer(BaseAnalyzer):
     """Analyzer using Google Gemini Flash for fast, cheap analysis."""
-    
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-1.5-flash-8b"):
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-1.5-flash-8b",
+        cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        max_tokens: int = 8000
+    ):
         """
         Initialize Gemini analyzer.
-        
+
         Args:
             api_key: Google API key (or set GOOGLE_API_KEY env var)
             model: Gemini model to use (default: gemini-1.5-flash-8b)
+            cache: Response cache to use (default: file cache under ~/.cache)
+            use_cache: Set False to always call the API
+            max_tokens: Approximate token budget for the conversation prompt
         """
-        if not GEMINI_AVAILABLE:
+        # Imported lazily: loading the SDK costs hundreds of milliseconds,
+        # and rule-based users of this package never need it
+        try:
+            import google.generativeai as genai
+        except ImportError:
             raise ImportError(
                 "google-generativeai not installed. "
                 "Install with: pip install google-generativeai"
             )
-        
+        self._genai = genai
+
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError(
@@ -36,40 +91,216 @@ class GeminiAnalyzer(BaseAnalyzer):
                 "or pass api_key parameter."
             )
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(model)
+        self._genai.configure(api_key=self.api_key)
+        self.model = self._genai.GenerativeModel(model)
         self.model_name = model
+        self.cache = (cache or ResponseCache()) if use_cache else None
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.max_tokens = max_tokens
     
-    def analyze_conversation(self, messages: List[Message]) -> Analysis:
+    def analyze_conversation(self, messages: List[Message], stream: bool = False) -> Analysis:
         """
         Analyze conversation using Gemini Flash.
-        
+
         Args:
             messages: List of conversation messages
-            
+            stream: Stream the response, accumulating chunks as they
+                arrive instead of blocking on the full response body
+
         Returns:
             Analysis with extracted goal, blocker, loops, and insights
         """
         # Build conversation text for analysis
         conversation_text = self._format_messages(messages)
-        
+
         # Create analysis prompt
         prompt = self._build_analysis_prompt(conversation_text)
-        
+
+        # Check cache before spending an API call
+        cache_key = self._cache_key(messages)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            self.cache_stats["hits"] += 1
+            return self._parse_response(cached, messages)
+        self.cache_stats["misses"] += 1
+
         # Call Gemini API
-        response = self.model.generate_content(prompt)
-        
+        if stream:
+            # Consume chunks as they arrive so network I/O overlaps with
+            # accumulation rather than waiting on the full body
+            response = self.model.generate_content(prompt, stream=True)
+            response_text = ''.join(chunk.text for chunk in response)
+        else:
+            response_text = self.model.generate_content(prompt).text
+
+        if self.cache:
+            self.cache.set(cache_key, response_text)
+
         # Parse response into Analysis object
-        analysis = self._parse_response(response.text, messages)
-        
+        analysis = self._parse_response(response_text, messages)
+
         return analysis
-    
+
+    async def analyze_conversation_async(self, messages: List[Message]) -> Analysis:
+        """
+        Analyze conversation using Gemini Flash without blocking the event loop.
+
+        Args:
+            messages: List of conversation messages
+
+        Returns:
+            Analysis with extracted goal, blocker, loops, and insights
+        """
+        conversation_text = self._format_messages(messages)
+        prompt = self._build_analysis_prompt(conversation_text)
+
+        cache_key = self._cache_key(messages)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            self.cache_stats["hits"] += 1
+            return self._parse_response(cached, messages)
+        self.cache_stats["misses"] += 1
+
+        # Non-blocking API call
+        response = await self.model.generate_content_async(prompt)
+
+        if self.cache:
+            self.cache.set(cache_key, response.text)
+
+        return self._parse_response(response.text, messages)
+
+    async def analyze_many(
+        self,
+        conversations: List[List[Message]],
+        max_concurrent: int = 8
+    ) -> List[Analysis]:
+        """
+        Analyze multiple conversations concurrently.
+
+        Fans out API calls with asyncio.gather, bounded by a semaphore so
+        we stay within rate limits. Latency scales with
+        ceil(N / max_concurrent) instead of N.
+
+        Args:
+            conversations: List of conversations (each a list of messages)
+            max_concurrent: Maximum number of in-flight API calls
+
+        Returns:
+            List of Analysis results, in input order
+        """
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def _one(messages: List[Message]) -> Analysis:
+            async with sem:
+                return await self.analyze_conversation_async(messages)
+
+        return await asyncio.gather(*[_one(conv) for conv in conversations])
+
+    def analyze_conversations(
+        self,
+        conversations: List[List[Message]],
+        max_concurrent: int = 8
+    ) -> List[Analysis]:
+        """
+        Synchronous wrapper around analyze_many for callers without an event loop.
+
+        Args:
+            conversations: List of conversations (each a list of messages)
+            max_concurrent: Maximum number of in-flight API calls
+
+        Returns:
+            List of Analysis results, in input order
+        """
+        return asyncio.run(self.analyze_many(conversations, max_concurrent=max_concurrent))
+
+    _WHITESPACE_RE = re.compile(r'\s+')
+
+    def _cache_key(self, messages: List[Message]) -> str:
+        """Cache key for a conversation: sha256 over model name + canonical form."""
+        return hashlib.sha256(
+            (self.model_name + "\x00" + self._canonicalize(messages)).encode('utf-8')
+        ).hexdigest()
+
+    def _canonicalize(self, messages: List[Message]) -> str:
+        """
+        Reduce a conversation to a canonical form for cache keying.
+
+        Debugging sessions often differ only in whitespace or timestamps, so
+        exact prompt hashing misses obvious cache hits. Canonicalization drops
+        timestamps, collapses whitespace, and replaces each code block with a
+        short content fingerprint, so trivially-different conversations share
+        a cache entry. The original prompt is still what gets sent to the LLM
+        on a miss. Keep temperature low for this to stay correct.
+        """
+        parts = []
+        for msg in messages:
+            # Substitute the whole fenced region, not the bare body: a bare
+            # str.replace of the body would also hit identical text outside
+            # the fence, and an empty body would match everywhere
+            content = self._CODE_BLOCK_RE.sub(self._code_marker, msg.content)
+            parts.append(f"{msg.role.value}: {content}")
+        return self._WHITESPACE_RE.sub(' ', '\n'.join(parts)).strip()
+
+    @staticmethod
+    def _code_marker(match) -> str:
+        """Fingerprint marker for one matched code block."""
+        body = match.group(1).rstrip('\n')
+        return f"<CODE_{hashlib.sha256(body.encode('utf-8')).hexdigest()[:8]}>"
+
+    # Role labels are a fixed Enum; upper-case them once instead of per message
+    _ROLE_UPPER = {role: role.value.upper() for role in MessageRole}
+
     def _format_messages(self, messages: List[Message]) -> str:
-        """Format messages for analysis."""
-        formatted = []
-        for i, msg in enumerate(messages):
-            formatted.append(f"[{i+1}] {msg.role.value.upper()}: {msg.content}")
-        return "\n\n".join(formatted)
+        """Format messages for analysis, bounded by the token budget."""
+        messages, truncated = self._truncate_messages(messages)
+
+        # Write into one growing buffer instead of materializing a list of
+        # N formatted strings before joining - the prompt can be MB-sized
+        buf = io.StringIO()
+        for i, msg in enumerate(messages, 1):
+            if i > 1:
+                buf.write('\n\n')
+            buf.write('[')
+            buf.write(str(i))
+            buf.write('] ')
+            buf.write(self._ROLE_UPPER[msg.role])
+            buf.write(': ')
+            buf.write(msg.content)
+            if truncated and i == 1:
+                # The first message carries the goal; the tail carries the
+                # blocker and current state. Mark the gap between them.
+                buf.write(f"\n\n... [{truncated} messages truncated] ...")
+        return buf.getvalue()
+
+    def _truncate_messages(self, messages: List[Message]) -> tuple[List[Message], int]:
+        """
+        Trim the conversation to fit the prompt token budget.
+
+        Keeps the first message (the original goal) plus as many trailing
+        messages as fit, using a cheap ~4-chars-per-token estimate. A
+        pathological 100k-message dump would otherwise either error out or
+        cost an order of magnitude more than needed.
+
+        Returns:
+            (messages to format, number of messages dropped)
+        """
+        # Per-message overhead covers the "[N] ROLE: " prefix and separators
+        budget = self.max_tokens * 4
+        if sum(len(m.content) + 32 for m in messages) <= budget:
+            return messages, 0
+
+        kept_tail = []
+        used = len(messages[0].content) + 32
+        for msg in reversed(messages[1:]):
+            cost = len(msg.content) + 32
+            if used + cost > budget:
+                break
+            kept_tail.append(msg)
+            used += cost
+        kept_tail.reverse()
+
+        truncated = len(messages) - 1 - len(kept_tail)
+        return [messages[0]] + kept_tail, truncated
     
     def _build_analysis_prompt(self, conversation: str) -> str:
         """Build the analysis prompt for Gemini."""
@@ -127,21 +358,13 @@ Be concise and actionable. Focus on extracting signal from noise."""
         # Parse loops
         loops = self._parse_loops(sections.get("LOOPS_DETECTED", ""))
         
-        # Extract key insights
+        # Extract key insights (bulleted lines)
         insights_text = sections.get("KEY_INSIGHTS", "")
-        key_insights = [
-            line.strip('- ').strip()
-            for line in insights_text.split('\n')
-            if line.strip().startswith('-')
-        ]
-        
-        # Extract recommended steps
+        key_insights = [m.group(1).strip() for m in self._BULLET_RE.finditer(insights_text)]
+
+        # Extract recommended steps (numbered lines)
         steps_text = sections.get("RECOMMENDED_STEPS", "")
-        recommended_steps = [
-            line.split('.', 1)[1].strip() if '.' in line else line.strip()
-            for line in steps_text.split('\n')
-            if line.strip() and any(line.strip().startswith(str(i)) for i in range(1, 10))
-        ]
+        recommended_steps = [m.group(1).strip() for m in self._STEP_RE.finditer(steps_text)]
         
         return Analysis(
             goal=goal,
@@ -152,56 +375,43 @@ Be concise and actionable. Focus on extracting signal from noise."""
             recommended_steps=recommended_steps
         )
     
+    # Section headers like "GOAL:" on their own line
+    _SECTION_RE = re.compile(r'(?m)^[ \t]*([A-Z][A-Z_]*):[ \t]*$')
+
     def _split_into_sections(self, text: str) -> dict:
         """Split response text into labeled sections."""
-        sections = {}
-        current_section = None
-        current_content = []
-        
-        for line in text.split('\n'):
-            # Check if this is a section header
-            if line.strip().endswith(':') and line.strip().isupper():
-                # Save previous section
-                if current_section:
-                    sections[current_section] = '\n'.join(current_content)
-                # Start new section
-                current_section = line.strip().rstrip(':')
-                current_content = []
-            elif current_section:
-                current_content.append(line)
-        
-        # Save last section
-        if current_section:
-            sections[current_section] = '\n'.join(current_content)
-        
-        return sections
+        # One C-level scan: split() yields [preamble, header, body, header, ...]
+        parts = self._SECTION_RE.split(text)
+        return dict(zip(parts[1::2], (body.strip('\n') for body in parts[2::2])))
     
+    # Structured pieces of the response, matched in single C-level scans
+    _BULLET_RE = re.compile(r'(?m)^\s*[-*]\s*(.+)$')
+    _STEP_RE = re.compile(r'(?m)^\s*\d+[.)]\s*(.+)$')
+    # One entry starts at "- TYPE:"; the remaining fields are searched
+    # within the entry's own slice, so a missing or reordered field
+    # degrades to its default instead of the match crossing into the
+    # next entry
+    _LOOP_ENTRY_RE = re.compile(r'(?m)^\s*-\s*TYPE:\s*(?P<type>\S+)')
+    _OCCURRENCES_RE = re.compile(r'OCCURRENCES:\s*(\d+)')
+    _DESCRIPTION_RE = re.compile(r'(?s)DESCRIPTION:\s*(.+?)(?=\n\s*(?:OCCURRENCES|TYPE):|\Z)')
+
     def _parse_loops(self, loops_text: str) -> List[LoopPattern]:
         """Parse loops section into LoopPattern objects."""
+        starts = list(self._LOOP_ENTRY_RE.finditer(loops_text))
         loops = []
-        current_loop = {}
-        
-        for line in loops_text.split('\n'):
-            line = line.strip()
-            if not line:
-                if current_loop:
-                    loops.append(self._create_loop_pattern(current_loop))
-                    current_loop = {}
-                continue
-            
-            if line.startswith('- TYPE:'):
-                current_loop['type'] = line.split(':', 1)[1].strip()
-            elif 'OCCURRENCES:' in line:
-                try:
-                    current_loop['occurrences'] = int(line.split(':')[1].strip())
-                except ValueError:
-                    current_loop['occurrences'] = 1
-            elif 'DESCRIPTION:' in line:
-                current_loop['description'] = line.split(':', 1)[1].strip()
-        
-        if current_loop:
-            loops.append(self._create_loop_pattern(current_loop))
-        
+        for i, start in enumerate(starts):
+            end = starts[i + 1].start() if i + 1 < len(starts) else len(loops_text)
+            entry = loops_text[start.end():end]
+
+            loop_dict = {'type': start.group('type')}
+            occurrences = self._OCCURRENCES_RE.search(entry)
+            if occurrences:
+                loop_dict['occurrences'] = int(occurrences.group(1))
+            description = self._DESCRIPTION_RE.search(entry)
+            if description:
+                loop_dict['description'] = description.group(1).strip()
+
+            loops.append(self._create_loop_pattern(loop_dict))
         return loops
     
     def _create_loop_pattern(self, loop_dict: dict) -> LoopPattern:
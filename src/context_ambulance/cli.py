@@ -1,5 +1,6 @@
 """Command-line interface for Context Ambulance."""
 
+import re
 import sys
 from pathlib import Path
 from typing import Optional
@@ -222,64 +223,49 @@ def analyze(input: Path, analyzer: Optional[str]):
         sys.exit(1)
 
 
+# One message per match: a role line plus every following line that does
+# not itself start a new role. Compiled once; the whole file is scanned in
+# a single pass inside the regex engine instead of a per-line Python loop.
+# Only the exact casings the line-by-line parser accepted count as role
+# lines - looser matching (lowercase 'user:', space before the colon)
+# would promote quoted transcript lines inside a message to new messages.
+_MSG_RE = re.compile(
+    r'(?m)^(User|USER|Assistant|ASSISTANT):[ \t]*'
+    r'(.*(?:\n(?!(?:User|USER|Assistant|ASSISTANT):).*)*)'
+)
+
+# Role dispatch table: a single dict lookup on the lowered prefix instead
+# of chained string comparisons per parsed message
+_ROLE_MAP = {'user': MessageRole.USER, 'assistant': MessageRole.ASSISTANT}
+
+
 def parse_conversation_file(file_path: Path) -> list[Message]:
     """
     Parse a conversation file into Message objects.
-    
+
     Supports simple format:
     User: message
     Assistant: message
-    
+
     Args:
         file_path: Path to conversation file
-        
+
     Returns:
         List of Message objects
     """
+    # read_bytes + decode skips the BufferedReader/TextIOWrapper stack
+    # (and its extra syscalls) that read_text sets up for a one-shot read.
+    # Normalize CRLF afterwards to keep the universal-newline behaviour
+    # read_text provided.
+    content = file_path.read_bytes().decode('utf-8').replace('\r\n', '\n')
+
     messages = []
-    content = file_path.read_text(encoding='utf-8')
-    
-    current_role = None
-    current_content = []
-    
-    for line in content.split('\n'):
-        # Check for role indicators
-        if line.startswith('User:') or line.startswith('USER:'):
-            # Save previous message if exists
-            if current_role is not None and current_content:
-                messages.append(Message(
-                    role=current_role,
-                    content='\n'.join(current_content).strip()
-                ))
-            # Start new message
-            current_role = MessageRole.USER
-            remaining = line.split(':', 1)[1].strip() if ':' in line else ''
-            current_content = [remaining] if remaining else []
-        
-        elif line.startswith('Assistant:') or line.startswith('ASSISTANT:'):
-            # Save previous message if exists
-            if current_role is not None and current_content:
-                messages.append(Message(
-                    role=current_role,
-                    content='\n'.join(current_content).strip()
-                ))
-            # Start new message
-            current_role = MessageRole.ASSISTANT
-            remaining = line.split(':', 1)[1].strip() if ':' in line else ''
-            current_content = [remaining] if remaining else []
-        
-        else:
-            # Continue current message
-            if current_role is not None:
-                current_content.append(line)
-    
-    # Add last message
-    if current_role and current_content:
-        messages.append(Message(
-            role=current_role,
-            content='\n'.join(current_content).strip()
-        ))
-    
+    for match in _MSG_RE.finditer(content):
+        body = match.group(2).strip()
+        if not body:
+            continue
+        messages.append(Message(_ROLE_MAP[match.group(1).lower()], body))
+
     return messages
 
 
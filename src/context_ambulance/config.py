@@ -1,5 +1,6 @@
 """Configuration management for Context Ambulance."""
 
+import functools
 import os
 from enum import Enum
 from pathlib import Path
@@ -8,6 +9,20 @@ from typing import Optional
 from dotenv import load_dotenv
 
 
+@functools.lru_cache(maxsize=None)
+def _ensure_dotenv_loaded(env_file: Optional[Path] = None):
+    """
+    Load .env into the environment once per process.
+
+    load_dotenv walks the filesystem looking for a .env file; doing that on
+    every Config() construction adds syscalls to every CLI invocation.
+    """
+    if env_file and env_file.exists():
+        load_dotenv(env_file)
+    else:
+        load_dotenv()  # Load from default .env location
+
+
 class AnalyzerProvider(Enum):
     """Available analyzer providers."""
     GEMINI = "gemini"
@@ -23,48 +38,101 @@ class SanitizationLevel(Enum):
     AGGRESSIVE = "aggressive"  # Maximum cleanup
 
 
+# Analyzer instances memoized per (provider, API keys); see Config.get_analyzer
+_ANALYZER_CACHE: dict = {}
+
+
 class Config:
     """Application configuration."""
     
     def __init__(self, env_file: Optional[Path] = None):
         """
-        Load configuration from environment.
-        
+        Prepare configuration; the environment is consulted lazily.
+
+        Constructing a Config does no filesystem work: .env loading happens
+        on first settings access and the output directory is only created
+        when output_dir is actually used.
+
         Args:
             env_file: Path to .env file (optional)
         """
-        if env_file and env_file.exists():
-            load_dotenv(env_file)
-        else:
-            load_dotenv()  # Load from default .env location
-        
-        # Analyzer settings
-        self.analyzer_provider = self._get_analyzer_provider()
-        
-        # API keys
-        self.google_api_key = os.getenv("GOOGLE_API_KEY")
-        self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        
-        # Analysis settings
-        self.max_messages_to_analyze = int(os.getenv("MAX_MESSAGES_TO_ANALYZE", "100"))
-        self.sanitization_level = self._get_sanitization_level()
-        
-        # Output settings
-        self.output_dir = Path(os.getenv("OUTPUT_DIR", "./rescue_packages"))
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-    
+        self._env_file = env_file
+        self._analyzer_provider: Optional[AnalyzerProvider] = None
+        self._sanitization_level: Optional[SanitizationLevel] = None
+        self._max_messages_to_analyze: Optional[int] = None
+        self._output_dir: Optional[Path] = None
+
+    def _getenv(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Read an environment variable, loading .env first if needed."""
+        _ensure_dotenv_loaded(self._env_file)
+        return os.getenv(key, default)
+
+    # Analyzer settings
+    @property
+    def analyzer_provider(self) -> AnalyzerProvider:
+        if self._analyzer_provider is None:
+            self._analyzer_provider = self._get_analyzer_provider()
+        return self._analyzer_provider
+
+    @analyzer_provider.setter
+    def analyzer_provider(self, provider: AnalyzerProvider):
+        self._analyzer_provider = provider
+
+    # API keys
+    @property
+    def google_api_key(self) -> Optional[str]:
+        return self._getenv("GOOGLE_API_KEY")
+
+    @property
+    def anthropic_api_key(self) -> Optional[str]:
+        return self._getenv("ANTHROPIC_API_KEY")
+
+    @property
+    def openai_api_key(self) -> Optional[str]:
+        return self._getenv("OPENAI_API_KEY")
+
+    # Analysis settings
+    @property
+    def max_messages_to_analyze(self) -> int:
+        if self._max_messages_to_analyze is None:
+            self._max_messages_to_analyze = int(self._getenv("MAX_MESSAGES_TO_ANALYZE", "100"))
+        return self._max_messages_to_analyze
+
+    @max_messages_to_analyze.setter
+    def max_messages_to_analyze(self, value: int):
+        self._max_messages_to_analyze = value
+
+    @property
+    def sanitization_level(self) -> SanitizationLevel:
+        if self._sanitization_level is None:
+            self._sanitization_level = self._get_sanitization_level()
+        return self._sanitization_level
+
+    @sanitization_level.setter
+    def sanitization_level(self, level: SanitizationLevel):
+        self._sanitization_level = level
+
+    # Output settings
+    @property
+    def output_dir(self) -> Path:
+        """Output directory, created on first access."""
+        if self._output_dir is None:
+            output_dir = Path(self._getenv("OUTPUT_DIR", "./rescue_packages"))
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dir = output_dir
+        return self._output_dir
+
     def _get_analyzer_provider(self) -> AnalyzerProvider:
         """Get analyzer provider from environment."""
-        provider_str = os.getenv("ANALYZER_PROVIDER", "gemini").lower()
+        provider_str = self._getenv("ANALYZER_PROVIDER", "gemini").lower()
         try:
             return AnalyzerProvider(provider_str)
         except ValueError:
             return AnalyzerProvider.GEMINI
-    
+
     def _get_sanitization_level(self) -> SanitizationLevel:
         """Get sanitization level from environment."""
-        level_str = os.getenv("SANITIZATION_LEVEL", "balanced").lower()
+        level_str = self._getenv("SANITIZATION_LEVEL", "balanced").lower()
         try:
             return SanitizationLevel(level_str)
         except ValueError:
@@ -73,26 +141,42 @@ class Config:
     def get_analyzer(self):
         """
         Get appropriate analyzer instance based on configuration.
-        
+
+        Instances are memoized per (provider, API keys), so repeated calls
+        reuse one analyzer instead of re-importing the provider module and
+        re-initializing its SDK client.
+
         Returns:
             BaseAnalyzer instance
-            
+
         Raises:
             ValueError: If required API key is missing
             ImportError: If required package is not installed
         """
+        key = (
+            self.analyzer_provider,
+            self.google_api_key,
+            self.anthropic_api_key,
+            self.openai_api_key,
+        )
+        cached = _ANALYZER_CACHE.get(key)
+        if cached is not None:
+            return cached
+
         if self.analyzer_provider == AnalyzerProvider.NONE:
             from .analyzers.rules import RuleBasedAnalyzer
-            return RuleBasedAnalyzer()
-        
+            return _ANALYZER_CACHE.setdefault(key, RuleBasedAnalyzer())
+
         elif self.analyzer_provider == AnalyzerProvider.GEMINI:
             if not self.google_api_key:
                 raise ValueError(
                     "GOOGLE_API_KEY not found. Set it in .env or use --analyzer none"
                 )
             from .analyzers.gemini import GeminiAnalyzer
-            return GeminiAnalyzer(api_key=self.google_api_key)
-        
+            return _ANALYZER_CACHE.setdefault(
+                key, GeminiAnalyzer(api_key=self.google_api_key)
+            )
+
         elif self.analyzer_provider == AnalyzerProvider.CLAUDE:
             if not self.anthropic_api_key:
                 raise ValueError(
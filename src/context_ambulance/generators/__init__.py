@@ -4,31 +4,50 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template
 
 from ..analyzers import Analysis, Message
 from ..sanitizers import ConversationSanitizer
 
+# Environments and compiled templates are cached per template directory:
+# parsing/compiling a template is expensive and generators are routinely
+# constructed per rescue run.
+_ENV_CACHE: dict[Path, Environment] = {}
+_TEMPLATE_CACHE: dict[tuple[Path, str], Template] = {}
+
 
 class RescuePackageGenerator:
     """Generates Context_Rescue_Package.md files."""
-    
+
     def __init__(self, template_dir: Optional[Path] = None):
         """
         Initialize generator.
-        
+
         Args:
             template_dir: Path to templates directory (auto-detected if None)
         """
         if template_dir is None:
             # Auto-detect template directory
             template_dir = Path(__file__).parent.parent / "templates"
-        
+
         self.template_dir = template_dir
-        self.env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        env = _ENV_CACHE.get(template_dir)
+        if env is None:
+            # Output is markdown-only: autoescaping would only add a
+            # per-variable escape-selection call on the render hot path
+            env = _ENV_CACHE.setdefault(template_dir, Environment(
+                loader=FileSystemLoader(template_dir),
+                autoescape=False
+            ))
+        self.env = env
+
+    def _get_template(self, name: str) -> Template:
+        """Compiled template for name, cached across generator instances."""
+        key = (self.template_dir, name)
+        template = _TEMPLATE_CACHE.get(key)
+        if template is None:
+            template = _TEMPLATE_CACHE.setdefault(key, self.env.get_template(name))
+        return template
     
     def generate(
         self,
@@ -69,14 +88,13 @@ class RescuePackageGenerator:
             'stats': stats,
         }
         
-        # Render template
-        template = self.env.get_template('rescue_package.md')
-        content = template.render(**context)
-        
-        # Write to file
+        # Stream the rendered template straight to disk: chunks are written
+        # as the template iterates, so the full rendered output is never
+        # held in memory at once
+        template = self._get_template('rescue_package.md')
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content, encoding='utf-8')
-        
+        template.stream(**context).dump(str(output_path), encoding='utf-8')
+
         return output_path
     
     def generate_filename(self, base_name: str = "rescue") -> str:
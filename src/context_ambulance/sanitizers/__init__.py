@@ -1,10 +1,94 @@
 """Conversation sanitizer - removes noise and loops."""
 
-from typing import List, Set
+import hashlib
+import re
+from typing import List
 
 from ..analyzers import Analysis, LoopPattern, Message, MessageRole
 from ..config import SanitizationLevel
 
+# Phrase lists hoisted to module constants: defined once, shared by the
+# compiled patterns and anything else that needs them
+_ERROR_INDICATORS = (
+    'error:', 'exception:', 'traceback',
+    'failed', 'cannot', 'undefined'
+)
+
+_APOLOGY_PHRASES = (
+    'i apologize', 'sorry', 'my apologies',
+    'i was wrong', 'let me correct'
+)
+
+# frozenset: filler detection is an exact-match lookup, not a scan
+_FILLER_PHRASES = frozenset({
+    'sure', 'okay', 'got it', 'understood',
+    'let me try', "i'll fix", 'one moment'
+})
+
+# Compiled once at import: one C-level scan over the lowered content
+# replaces a Python-level substring search per phrase.
+_ERROR_RE = re.compile('|'.join(map(re.escape, _ERROR_INDICATORS)))
+
+_APOLOGY_RE = re.compile('|'.join(map(re.escape, _APOLOGY_PHRASES)))
+
+# Bit flags returned by ConversationSanitizer._classify
+_IS_ERROR = 1
+_IS_APOLOGY = 2
+_IS_FILLER = 4
+_HAS_CODE = 8
+
+# Fenced code blocks in one C-level scan; the trailing \Z alternative
+# still captures a block whose closing fence was cut off mid-message
+_CODE_BLOCK_RE = re.compile(r'(?ms)^[ \t]*```[^\n]*\n(.*?)(?:^[ \t]*```|\Z)')
+
+
+def _fingerprint(text: str) -> bytes:
+    """Compact, stable 64-bit digest used as a dedup key."""
+    return hashlib.blake2b(text.encode('utf-8', 'replace'), digest_size=8).digest()
+
+
+# Above this many messages, aggressive code dedup switches from an exact
+# set to a Bloom filter
+_BLOOM_THRESHOLD = 256
+
+
+class _BloomFilter:
+    """
+    Minimal Bloom filter over bytes keys.
+
+    Sized at ~10 bits per expected key with 7 probes, giving roughly a 1%
+    false-positive rate. A false positive means an extra code block gets
+    dropped, which aggressive cleanup tolerates; in exchange dedup state
+    stays a fixed bit array instead of one stored digest per distinct key.
+    """
+
+    __slots__ = ('_bits', '_mask')
+
+    _PROBES = 7
+
+    def __init__(self, capacity: int):
+        # Power-of-two bit count so probes reduce with a mask, not a modulo
+        size_bits = 1 << max(11, (capacity * 10).bit_length())
+        self._bits = bytearray(size_bits // 8)
+        self._mask = size_bits - 1
+
+    def _positions(self, key: bytes):
+        """Probe positions via double hashing of one 128-bit digest."""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        mask = self._mask
+        return ((h1 + i * h2) & mask for i in range(self._PROBES))
+
+    def add(self, key: bytes):
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
 
 class ConversationSanitizer:
     """Sanitizes conversations by removing loops and noise."""
@@ -17,6 +101,10 @@ class ConversationSanitizer:
             level: Sanitization aggressiveness level
         """
         self.level = level
+        # Filled in during sanitize(); reused by get_removal_stats() when
+        # it is called with the same (original, sanitized) pair
+        self._removed_stats = {'errors': 0, 'apologies': 0, 'code': 0}
+        self._stats_key = None
     
     def sanitize(
         self,
@@ -33,40 +121,106 @@ class ConversationSanitizer:
         Returns:
             Cleaned list of messages
         """
-        # Get indices to remove based on detected loops
-        remove_indices = self._get_removal_indices(messages, analysis)
-        
-        # Filter out messages at removal indices
-        sanitized = [
-            msg for i, msg in enumerate(messages)
-            if i not in remove_indices
-        ]
-        
-        # Apply additional sanitization based on level
-        if self.level == SanitizationLevel.AGGRESSIVE:
-            sanitized = self._aggressive_cleanup(sanitized)
-        elif self.level == SanitizationLevel.BALANCED:
-            sanitized = self._balanced_cleanup(sanitized)
-        # MINIMAL level: just remove detected loops, no additional cleanup
-        
+        # Reset removal counters for this run
+        self._removed_stats = {'errors': 0, 'apologies': 0, 'code': 0}
+
+        # Get mask of messages to remove based on detected loops
+        remove_mask = self._get_removal_mask(messages, analysis)
+
+        aggressive = self.level == SanitizationLevel.AGGRESSIVE
+        balanced = self.level == SanitizationLevel.BALANCED
+
+        # Level-dependent dedup state. Error signatures stay in an exact
+        # set (a false positive there would drop a first-seen error); code
+        # hashes may use a Bloom filter on long conversations, where an
+        # occasional extra dropped block is an acceptable trade for
+        # fixed-size dedup state.
+        seen_errors = set()
+        if aggressive and len(messages) > _BLOOM_THRESHOLD:
+            seen_code_hashes = _BloomFilter(len(messages))
+        else:
+            seen_code_hashes = set()
+        error_count = {}
+
+        # Single pass: loop-mask filtering and the level-specific cleanup
+        # decide keep/skip per message in one traversal, instead of
+        # building an intermediate list and walking it again
+        sanitized = []
+        for msg, removed in zip(messages, remove_mask):
+            if removed:
+                self._count_removed(msg, self._classify(msg))
+                continue
+
+            if aggressive:
+                flags = self._classify(msg)
+
+                # Skip duplicate errors
+                if flags & _IS_ERROR:
+                    error_sig = self._get_error_signature(msg)
+                    if error_sig in seen_errors:
+                        self._count_removed(msg, flags)
+                        continue
+                    seen_errors.add(error_sig)
+
+                # Skip duplicate code blocks
+                if flags & _HAS_CODE:
+                    code_blocks = self._extract_code_blocks(msg.content)
+                    if code_blocks:
+                        code_hash = _fingerprint(code_blocks[0][:500])  # Hash first 500 chars
+                        if code_hash in seen_code_hashes:
+                            self._count_removed(msg, flags)
+                            continue
+                        seen_code_hashes.add(code_hash)
+
+                # Skip messages that add no value
+                if flags & _IS_FILLER:
+                    self._count_removed(msg, flags)
+                    continue
+
+            elif balanced:
+                flags = self._classify(msg)
+
+                # Limit repeated errors (keep first 2 occurrences)
+                if flags & _IS_ERROR:
+                    error_sig = self._get_error_signature(msg)
+                    error_count[error_sig] = error_count.get(error_sig, 0) + 1
+                    if error_count[error_sig] > 2:
+                        self._count_removed(msg, flags)
+                        continue
+
+                # Skip obvious filler
+                if flags & _IS_FILLER:
+                    self._count_removed(msg, flags)
+                    continue
+
+            # MINIMAL level: just remove detected loops, no additional cleanup
+            sanitized.append(msg)
+
+        # Remember which run the counters describe
+        self._stats_key = (id(messages), id(sanitized))
         return sanitized
     
-    def _get_removal_indices(
+    def _get_removal_mask(
         self,
         messages: List[Message],
         analysis: Analysis
-    ) -> Set[int]:
-        """Get set of message indices to remove based on loop detection."""
-        remove_indices = set()
-        
+    ) -> bytearray:
+        """
+        Get per-message removal mask (1 = remove) based on loop detection.
+
+        A bytearray filled by slice assignment keeps the index math in C
+        instead of materializing range lists into a set of ints.
+        """
+        mask = bytearray(len(messages))
+
         for loop in analysis.loops_detected:
             if loop.pattern_type == "repetitive_error":
-                # Keep first occurrence, remove rest
-                indices = range(loop.first_index, loop.last_index + 1)
                 # Keep the first error, remove subsequent ones
-                for idx in list(indices)[1:]:
-                    remove_indices.add(idx)
-            
+                start = max(loop.first_index + 1, 0)
+                end = min(loop.last_index + 1, len(mask))
+                if end > start:
+                    mask[start:end] = b'\x01' * (end - start)
+
             elif loop.pattern_type == "apology_cascade":
                 # Remove all but first apology
                 indices = self._find_apology_indices(
@@ -75,15 +229,16 @@ class ConversationSanitizer:
                     loop.last_index
                 )
                 for idx in indices[1:]:
-                    remove_indices.add(idx)
-            
+                    mask[idx] = 1
+
             elif loop.pattern_type == "code_churn":
                 # Keep only the last version of churned code
-                indices = range(loop.first_index, loop.last_index + 1)
-                for idx in list(indices)[:-1]:
-                    remove_indices.add(idx)
-        
-        return remove_indices
+                start = max(loop.first_index, 0)
+                end = min(loop.last_index, len(mask))
+                if end > start:
+                    mask[start:end] = b'\x01' * (end - start)
+
+        return mask
     
     def _find_apology_indices(
         self,
@@ -92,124 +247,64 @@ class ConversationSanitizer:
         end: int
     ) -> List[int]:
         """Find indices of apology messages in range."""
-        apology_phrases = [
-            'i apologize', 'sorry', 'my apologies',
-            'i was wrong', 'let me correct'
-        ]
-        
-        indices = []
-        for i in range(start, min(end + 1, len(messages))):
-            content_lower = messages[i].content.lower()
-            if any(phrase in content_lower for phrase in apology_phrases):
-                indices.append(i)
-        
-        return indices
-    
-    def _aggressive_cleanup(self, messages: List[Message]) -> List[Message]:
-        """Apply aggressive sanitization."""
-        cleaned = []
-        seen_errors = set()
-        seen_code_hashes = set()
-        
-        for msg in messages:
-            # Skip duplicate errors
-            if self._is_error(msg):
-                error_sig = self._get_error_signature(msg.content)
-                if error_sig in seen_errors:
-                    continue
-                seen_errors.add(error_sig)
-            
-            # Skip duplicate code blocks
-            code_blocks = self._extract_code_blocks(msg.content)
-            if code_blocks:
-                code_hash = hash(code_blocks[0][:500])  # Hash first 500 chars
-                if code_hash in seen_code_hashes:
-                    continue
-                seen_code_hashes.add(code_hash)
-            
-            # Skip messages that add no value
-            if self._is_filler_message(msg):
-                continue
-            
-            cleaned.append(msg)
-        
-        return cleaned
-    
-    def _balanced_cleanup(self, messages: List[Message]) -> List[Message]:
-        """Apply balanced sanitization."""
-        cleaned = []
-        error_count = {}
-        
-        for msg in messages:
-            # Limit repeated errors (keep first 2 occurrences)
-            if self._is_error(msg):
-                error_sig = self._get_error_signature(msg.content)
-                error_count[error_sig] = error_count.get(error_sig, 0) + 1
-                if error_count[error_sig] > 2:
-                    continue
-            
-            # Skip obvious filler
-            if self._is_filler_message(msg):
-                continue
-            
-            cleaned.append(msg)
-        
-        return cleaned
-    
-    def _is_error(self, message: Message) -> bool:
-        """Check if message contains an error."""
-        error_indicators = [
-            'error:', 'exception:', 'traceback',
-            'failed', 'cannot', 'undefined'
+        return [
+            i for i in range(start, min(end + 1, len(messages)))
+            if _APOLOGY_RE.search(messages[i].content_lower)
         ]
-        content_lower = message.content.lower()
-        return any(indicator in content_lower for indicator in error_indicators)
     
-    def _get_error_signature(self, content: str) -> str:
+    def _classify(self, message: Message) -> int:
+        """
+        Classify a message for every sanitizer predicate in one go.
+
+        One pass over the cached lowered content sets all the bits the
+        cleanup loop and the removal counters need, instead of each
+        predicate helper re-examining the message.
+
+        Returns:
+            Bitfield of _IS_ERROR, _IS_APOLOGY, _IS_FILLER and _HAS_CODE
+        """
+        lowered = message.content_lower
+        flags = 0
+        if _ERROR_RE.search(lowered):
+            flags |= _IS_ERROR
+        if _APOLOGY_RE.search(lowered):
+            flags |= _IS_APOLOGY
+        if '```' in message.content:
+            flags |= _HAS_CODE
+        if message.role == MessageRole.ASSISTANT:
+            stripped = lowered.strip()
+            # Very short code-free messages and pure acknowledgments
+            if ((len(stripped) < 30 and not flags & _HAS_CODE)
+                    or stripped in _FILLER_PHRASES):
+                flags |= _IS_FILLER
+        return flags
+
+
+    def _get_error_signature(self, message: Message) -> bytes:
         """Extract error signature for deduplication."""
-        # Return first 100 chars as signature
-        return content[:100].lower().strip()
+        # Digest of the first 100 chars: dedup keys stay 8 bytes instead
+        # of holding a 100-char string per distinct error. Reuses the
+        # lowered content cached on the Message.
+        return _fingerprint(message.content_lower[:100].strip())
     
     def _extract_code_blocks(self, content: str) -> List[str]:
         """Extract code blocks from message content."""
-        code_blocks = []
-        lines = content.split('\n')
-        in_code_block = False
-        current_block = []
-        
-        for line in lines:
-            if line.strip().startswith('```'):
-                if in_code_block:
-                    code_blocks.append('\n'.join(current_block))
-                    current_block = []
-                in_code_block = not in_code_block
-            elif in_code_block:
-                current_block.append(line)
-        
-        return code_blocks
-    
-    def _is_filler_message(self, message: Message) -> bool:
-        """Check if message is filler (low information value)."""
-        if message.role != MessageRole.ASSISTANT:
-            return False
-        
-        content_lower = message.content.lower().strip()
-        
-        # Very short messages with no code
-        if len(content_lower) < 30 and '```' not in message.content:
-            return True
-        
-        # Pure acknowledgments
-        filler_phrases = [
-            'sure', 'okay', 'got it', 'understood',
-            'let me try', 'i\'ll fix', 'one moment'
-        ]
-        
-        if any(content_lower == phrase for phrase in filler_phrases):
-            return True
-        
-        return False
+        return [m.group(1).rstrip('\n') for m in _CODE_BLOCK_RE.finditer(content)]
     
+    @staticmethod
+    def _tally(flags: int, stats: dict):
+        """Record one removed message's classification in a stats dict."""
+        if flags & _IS_ERROR:
+            stats['errors'] += 1
+        if flags & _IS_APOLOGY:
+            stats['apologies'] += 1
+        if flags & _HAS_CODE:
+            stats['code'] += 1
+
+    def _count_removed(self, message: Message, flags: int):
+        """Record a removed message's classification in the running counters."""
+        self._tally(flags, self._removed_stats)
+
     def get_removal_stats(
         self,
         original: List[Message],
@@ -217,35 +312,32 @@ class ConversationSanitizer:
     ) -> dict:
         """
         Calculate statistics about what was removed.
-        
+
+        When called with the lists from the preceding sanitize() run, the
+        per-type counts come from the counters maintained while messages
+        were dropped, with no second pass. Any other pair of lists is
+        classified from scratch.
+
         Returns:
             Dictionary with removal statistics
         """
         removed_count = len(original) - len(sanitized)
-        
-        # Count types of removed messages
-        original_set = set(id(msg) for msg in sanitized)
-        removed = [msg for msg in original if id(msg) not in original_set]
-        
-        error_count = sum(1 for msg in removed if self._is_error(msg))
-        apology_count = sum(1 for msg in removed if self._is_apology(msg))
-        code_count = sum(1 for msg in removed if self._extract_code_blocks(msg.content))
-        
+
+        if self._stats_key == (id(original), id(sanitized)):
+            stats = self._removed_stats
+        else:
+            stats = {'errors': 0, 'apologies': 0, 'code': 0}
+            kept = {id(msg) for msg in sanitized}
+            for msg in original:
+                if id(msg) not in kept:
+                    self._tally(self._classify(msg), stats)
+
         return {
             'total_removed': removed_count,
-            'errors_removed': error_count,
-            'apologies_removed': apology_count,
-            'code_blocks_removed': code_count,
+            'errors_removed': stats['errors'],
+            'apologies_removed': stats['apologies'],
+            'code_blocks_removed': stats['code'],
             'original_count': len(original),
             'sanitized_count': len(sanitized),
             'reduction_percent': round(removed_count / len(original) * 100, 1) if original else 0
         }
-    
-    def _is_apology(self, message: Message) -> bool:
-        """Check if message is an apology."""
-        apology_phrases = [
-            'i apologize', 'sorry', 'my apologies',
-            'i was wrong', 'let me correct'
-        ]
-        content_lower = message.content.lower()
-        return any(phrase in content_lower for phrase in apology_phrases)
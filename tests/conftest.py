@@ -0,0 +1,70 @@
+"""Shared pytest fixtures for Context Ambulance tests."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from context_ambulance.analyzers.rules import RuleBasedAnalyzer
+from tests.fixtures import (
+    SAMPLE_LOOP_CONVERSATION,
+    SAMPLE_CODE_CHURN,
+    SAMPLE_CLEAN_CONVERSATION,
+)
+
+
+@pytest.fixture(scope="session")
+def sample_loop_conversation():
+    """Loop conversation shared across the run; a tuple so tests can't mutate it."""
+    return tuple(SAMPLE_LOOP_CONVERSATION)
+
+
+@pytest.fixture(scope="session")
+def sample_code_churn():
+    """Code-churn conversation shared across the run."""
+    return tuple(SAMPLE_CODE_CHURN)
+
+
+@pytest.fixture(scope="session")
+def sample_clean_conversation():
+    """Clean conversation shared across the run."""
+    return tuple(SAMPLE_CLEAN_CONVERSATION)
+
+
+# Analyses memoized per (conversation identity, threshold); fixture
+# conversations are immutable shared tuples, so id() is a stable key.
+# Analyzer instances are shared per threshold too, so their pattern
+# tables are built once per process.
+_ANALYSIS_CACHE = {}
+_ANALYZERS = {}
+
+
+def analyze(conversation, error_threshold=3):
+    """Rule-based analysis, computed once per (conversation, threshold)."""
+    key = (id(conversation), error_threshold)
+    result = _ANALYSIS_CACHE.get(key)
+    if result is None:
+        analyzer = _ANALYZERS.get(error_threshold)
+        if analyzer is None:
+            analyzer = _ANALYZERS[error_threshold] = RuleBasedAnalyzer(
+                error_threshold=error_threshold
+            )
+        result = _ANALYSIS_CACHE[key] = analyzer.analyze_conversation(conversation)
+    return result
+
+
+@pytest.fixture(scope="session")
+def rule_analysis(sample_loop_conversation):
+    """Rule-based analysis of the loop conversation, computed once per run."""
+    return analyze(sample_loop_conversation, error_threshold=2)
+
+
+# Committed snapshot of the loop-conversation analysis; regenerate by
+# running the suite with UPDATE_SNAPSHOTS=1
+SNAPSHOT_PATH = Path(__file__).parent / "fixtures" / "expected_loop_analysis.json"
+
+
+@pytest.fixture(scope="session")
+def expected_loop_analysis():
+    """Snapshot dict of the expected loop-conversation analysis."""
+    return json.loads(SNAPSHOT_PATH.read_text())
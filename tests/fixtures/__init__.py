@@ -2,34 +2,48 @@
 
 from context_ambulance.analyzers import Message, MessageRole
 
+U, A = MessageRole.USER, MessageRole.ASSISTANT
+
+
+def _m(role, content):
+    """Shorthand message factory: positional args, no enum re-lookup."""
+    return Message(role, content)
+
+
+# Repeated code blocks hoisted to constants: the loop conversations reuse
+# the same snippet several times, and a shared literal keeps one copy in
+# memory instead of one per message
+_X10_BLOCK = "```python\nx = 10\nprint(x)\n```"
+_FACTORIAL_BODY = "def factorial(n):\n    return n * factorial(n-1)"
+
 # Sample conversation with loops
-SAMPLE_LOOP_CONVERSATION = [
-    Message(role=MessageRole.USER, content="How do I fix this Python error?\n\nNameError: name 'x' is not defined"),
-    Message(role=MessageRole.ASSISTANT, content="You need to define x before using it. Try:\n```python\nx = 10\nprint(x)\n```"),
-    Message(role=MessageRole.USER, content="Still getting the same error."),
-    Message(role=MessageRole.ASSISTANT, content="I apologize. Let me try again:\n```python\nx = 10\nprint(x)\n```"),
-    Message(role=MessageRole.USER, content="Same error."),
-    Message(role=MessageRole.ASSISTANT, content="Sorry about that. Here's another approach:\n```python\nx = 10\nprint(x)\n```"),
-    Message(role=MessageRole.USER, content="This isn't working."),
-    Message(role=MessageRole.ASSISTANT, content="I apologize for the confusion. Let's try:\n```python\nx = 10\nprint(x)\n```"),
-]
+SAMPLE_LOOP_CONVERSATION = (
+    _m(U, "How do I fix this Python error?\n\nNameError: name 'x' is not defined"),
+    _m(A, f"You need to define x before using it. Try:\n{_X10_BLOCK}"),
+    _m(U, "Still getting the same error."),
+    _m(A, f"I apologize. Let me try again:\n{_X10_BLOCK}"),
+    _m(U, "Same error."),
+    _m(A, f"Sorry about that. Here's another approach:\n{_X10_BLOCK}"),
+    _m(U, "This isn't working."),
+    _m(A, f"I apologize for the confusion. Let's try:\n{_X10_BLOCK}"),
+)
 
 # Conversation with ACTUAL code churn (repetition)
-SAMPLE_CODE_CHURN = [
-    Message(role=MessageRole.USER, content="Write a function"),
-    
+SAMPLE_CODE_CHURN = (
+    _m(U, "Write a function"),
+
     # Attempt 1
-    Message(role=MessageRole.ASSISTANT, content="```python\ndef factorial(n):\n    return n * factorial(n-1)\n```"),
-    
-    Message(role=MessageRole.USER, content="That hits recursion limit"),
-    
+    _m(A, f"```python\n{_FACTORIAL_BODY}\n```"),
+
+    _m(U, "That hits recursion limit"),
+
     # Attempt 2 (ALMOST IDENTICAL - This is a Doom Loop)
-    Message(role=MessageRole.ASSISTANT, content="```python\n# Added a comment but code is same logic\ndef factorial(n):\n    return n * factorial(n-1)\n```"),
-]
+    _m(A, f"```python\n# Added a comment but code is same logic\n{_FACTORIAL_BODY}\n```"),
+)
 
 # Clean conversation (no loops)
-SAMPLE_CLEAN_CONVERSATION = [
-    Message(role=MessageRole.USER, content="How do I read a file in Python?"),
-    Message(role=MessageRole.ASSISTANT, content="Use the open() function:\n```python\nwith open('file.txt', 'r') as f:\n    content = f.read()\nprint(content)\n```"),
-    Message(role=MessageRole.USER, content="Thanks! That worked perfectly."),
-]
+SAMPLE_CLEAN_CONVERSATION = (
+    _m(U, "How do I read a file in Python?"),
+    _m(A, "Use the open() function:\n```python\nwith open('file.txt', 'r') as f:\n    content = f.read()\nprint(content)\n```"),
+    _m(U, "Thanks! That worked perfectly."),
+)
@@ -1,69 +1,89 @@
 """Tests for analyzers."""
 
+import dataclasses
+import json
+import os
+
 import pytest
 
 from context_ambulance.analyzers import Message, MessageRole, LoopPattern
-from context_ambulance.analyzers.rules import RuleBasedAnalyzer
-from tests.fixtures import (
-    SAMPLE_LOOP_CONVERSATION,
-    SAMPLE_CODE_CHURN,
-    SAMPLE_CLEAN_CONVERSATION
-)
+from tests.conftest import SNAPSHOT_PATH, analyze
 
 
 class TestRuleBasedAnalyzer:
     """Tests for rule-based analyzer."""
-    
-    def test_detect_repetitive_errors(self):
+
+    def test_detect_repetitive_errors(self, expected_loop_analysis):
         """Test detection of repetitive error messages."""
-        analyzer = RuleBasedAnalyzer(error_threshold=2)
-        analysis = analyzer.analyze_conversation(SAMPLE_LOOP_CONVERSATION)
-        
         # Should detect the apology cascade
-        assert len(analysis.loops_detected) > 0
-        apology_loops = [l for l in analysis.loops_detected if l.pattern_type == "apology_cascade"]
+        loops = expected_loop_analysis["loops_detected"]
+        assert len(loops) > 0
+        apology_loops = [l for l in loops if l["pattern_type"] == "apology_cascade"]
         assert len(apology_loops) > 0
-    
-    # def test_detect_code_churn(self):
-    #     """Test detection of code churn."""
-    #     analyzer = RuleBasedAnalyzer()
-    #     analysis = analyzer.analyze_conversation(SAMPLE_CODE_CHURN)
-        
-    #     # Should detect code being modified repeatedly
-    #     code_loops = [l for l in analysis.loops_detected if l.pattern_type == "code_churn"]
-    #     assert len(code_loops) > 0
-    
-    def test_clean_conversation(self):
+
+    @pytest.mark.xfail(
+        reason="churn detection needs three similar blocks; this sample has two",
+        strict=False
+    )
+    def test_detect_code_churn(self, sample_code_churn):
+        """Test detection of code churn."""
+        analysis = analyze(sample_code_churn)
+
+        # Should detect code being modified repeatedly
+        code_loops = [l for l in analysis.loops_detected if l.pattern_type == "code_churn"]
+        assert len(code_loops) > 0
+
+    def test_clean_conversation(self, sample_clean_conversation):
         """Test that clean conversations don't trigger false positives."""
-        analyzer = RuleBasedAnalyzer()
-        analysis = analyzer.analyze_conversation(SAMPLE_CLEAN_CONVERSATION)
-        
+        analysis = analyze(sample_clean_conversation)
+
         # Should detect few or no loops
         assert len(analysis.loops_detected) == 0
-    
-    def test_extract_goal(self):
+
+    def test_extract_goal(self, expected_loop_analysis):
         """Test goal extraction."""
-        analyzer = RuleBasedAnalyzer()
-        analysis = analyzer.analyze_conversation(SAMPLE_LOOP_CONVERSATION)
-        
         # Goal should be from first user message
-        assert "Python error" in analysis.goal or "fix" in analysis.goal
-    
-    # def test_identify_blocker(self):
-    #     """Test blocker identification."""
-    #     analyzer = RuleBasedAnalyzer()
-    #     analysis = analyzer.analyze_conversation(SAMPLE_LOOP_CONVERSATION)
-        
-    #     # Blocker should reference the repetition or apologies
-    #     assert len(analysis.blocker) > 0
-    #     assert any(word in analysis.blocker.lower() for word in ['apolog', 'repeat', 'stuck'])
-    
-    def test_recommendations(self):
+        goal = expected_loop_analysis["goal"]
+        assert "Python error" in goal or "fix" in goal
+
+    @pytest.mark.xfail(
+        reason="blocker heuristic surfaces the triggering error, not the loop itself",
+        strict=False
+    )
+    def test_identify_blocker(self, rule_analysis):
+        """Test blocker identification."""
+        # Blocker should reference the repetition or apologies
+        assert len(rule_analysis.blocker) > 0
+        assert any(word in rule_analysis.blocker.lower() for word in ['apolog', 'repeat', 'stuck'])
+
+    def test_recommendations(self, expected_loop_analysis):
         """Test that recommendations are generated."""
-        analyzer = RuleBasedAnalyzer()
-        analysis = analyzer.analyze_conversation(SAMPLE_LOOP_CONVERSATION)
-        
-        assert len(analysis.recommended_steps) > 0
+        assert len(expected_loop_analysis["recommended_steps"]) > 0
+
+    def test_incremental_matches_batch(self, rule_analysis, sample_loop_conversation):
+        """Test that feeding messages incrementally matches the batch analysis."""
+        from context_ambulance.analyzers.rules import RuleBasedAnalyzer
+
+        analyzer = RuleBasedAnalyzer(error_threshold=2)
+        incremental = analyzer.analyze_incremental(
+            list(sample_loop_conversation[:4]),
+            list(sample_loop_conversation[4:])
+        )
+
+        assert incremental == rule_analysis
+
+    def test_analysis_matches_snapshot(self, rule_analysis, expected_loop_analysis):
+        """
+        End-to-end check that the analyzer still matches its committed snapshot.
+
+        Run with UPDATE_SNAPSHOTS=1 to regenerate the snapshot after an
+        intentional analyzer change.
+        """
+        actual = dataclasses.asdict(rule_analysis)
+        if os.environ.get("UPDATE_SNAPSHOTS") == "1":
+            SNAPSHOT_PATH.write_text(json.dumps(actual, indent=2) + "\n")
+        else:
+            assert actual == expected_loop_analysis
 
 
 class TestMessageParsing:
@@ -86,4 +106,7 @@ class TestMessageParsing:
         )
         str_repr = str(msg)
         assert "assistant" in str_repr
-        assert len(str_repr) < len(msg.content)  # Should be truncated
+        # Truncated to the first 100 chars with an ellipsis
+        assert str_repr.endswith("...")
+        assert "A" * 100 in str_repr
+        assert "A" * 101 not in str_repr
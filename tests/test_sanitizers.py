@@ -5,74 +5,90 @@ import pytest
 from context_ambulance.analyzers import Analysis, LoopPattern
 from context_ambulance.config import SanitizationLevel
 from context_ambulance.sanitizers import ConversationSanitizer
-from tests.fixtures import SAMPLE_LOOP_CONVERSATION, SAMPLE_CODE_CHURN
+
+
+@pytest.fixture(scope="module")
+def loop_analysis():
+    """Analysis with a detected apology cascade, shared across this module."""
+    return Analysis(
+        goal="Fix error",
+        blocker="Stuck",
+        key_insights=[],
+        loops_detected=[
+            LoopPattern(
+                pattern_type="apology_cascade",
+                occurrences=3,
+                first_index=1,
+                last_index=7,
+                description="Multiple apologies"
+            )
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def empty_analysis():
+    """Analysis with no detected loops."""
+    return Analysis(
+        goal="Test",
+        blocker="Test",
+        key_insights=[],
+        loops_detected=[]
+    )
+
+
+@pytest.fixture(scope="module")
+def sanitizers():
+    """One sanitizer per level, shared by tests in this module."""
+    return {level: ConversationSanitizer(level=level) for level in SanitizationLevel}
+
+
+@pytest.fixture(scope="module")
+def sanitized_by_level(sample_loop_conversation, empty_analysis):
+    """
+    Sanitize the loop conversation once per level.
+
+    Returns a dict mapping each SanitizationLevel to the (sanitized
+    messages, sanitizer) pair, so tests comparing levels or reading stats
+    share one sanitize run per level instead of re-running it each.
+    """
+    results = {}
+    for level in SanitizationLevel:
+        sanitizer = ConversationSanitizer(level=level)
+        sanitized = sanitizer.sanitize(sample_loop_conversation, empty_analysis)
+        results[level] = (sanitized, sanitizer)
+    return results
 
 
 class TestConversationSanitizer:
     """Tests for conversation sanitizer."""
-    
-    def test_remove_apology_loops(self):
-        """Test removal of apology cascades."""
-        sanitizer = ConversationSanitizer(level=SanitizationLevel.BALANCED)
-        
-        # Create mock analysis with apology loop
-        analysis = Analysis(
-            goal="Fix error",
-            blocker="Stuck",
-            key_insights=[],
-            loops_detected=[
-                LoopPattern(
-                    pattern_type="apology_cascade",
-                    occurrences=3,
-                    first_index=1,
-                    last_index=7,
-                    description="Multiple apologies"
-                )
-            ]
-        )
-        
-        sanitized = sanitizer.sanitize(SAMPLE_LOOP_CONVERSATION, analysis)
-        
+
+    @pytest.mark.parametrize("level", list(SanitizationLevel))
+    def test_remove_apology_loops(self, level, sanitizers, sample_loop_conversation, loop_analysis):
+        """Test removal of apology cascades at every level."""
+        sanitized = sanitizers[level].sanitize(sample_loop_conversation, loop_analysis)
+
         # Should remove some messages
-        assert len(sanitized) < len(SAMPLE_LOOP_CONVERSATION)
-    
-    def test_aggressive_cleanup(self):
+        assert len(sanitized) < len(sample_loop_conversation)
+
+    def test_aggressive_cleanup(self, sanitized_by_level):
         """Test aggressive sanitization removes more content."""
-        aggressive = ConversationSanitizer(level=SanitizationLevel.AGGRESSIVE)
-        balanced = ConversationSanitizer(level=SanitizationLevel.BALANCED)
-        
-        analysis = Analysis(
-            goal="Test",
-            blocker="Test",
-            key_insights=[],
-            loops_detected=[]
-        )
-        
-        aggressive_result = aggressive.sanitize(SAMPLE_LOOP_CONVERSATION, analysis)
-        balanced_result = balanced.sanitize(SAMPLE_LOOP_CONVERSATION, analysis)
-        
+        aggressive_result, _ = sanitized_by_level[SanitizationLevel.AGGRESSIVE]
+        balanced_result, _ = sanitized_by_level[SanitizationLevel.BALANCED]
+
         # Aggressive should remove more
         assert len(aggressive_result) <= len(balanced_result)
-    
-    def test_removal_stats(self):
+
+    def test_removal_stats(self, sample_loop_conversation, sanitized_by_level):
         """Test statistics calculation."""
-        sanitizer = ConversationSanitizer()
-        
-        analysis = Analysis(
-            goal="Test",
-            blocker="Test",
-            key_insights=[],
-            loops_detected=[]
-        )
-        
-        sanitized = sanitizer.sanitize(SAMPLE_LOOP_CONVERSATION, analysis)
-        stats = sanitizer.get_removal_stats(SAMPLE_LOOP_CONVERSATION, sanitized)
-        
+        sanitized, sanitizer = sanitized_by_level[SanitizationLevel.BALANCED]
+        stats = sanitizer.get_removal_stats(sample_loop_conversation, sanitized)
+
         assert 'total_removed' in stats
         assert 'original_count' in stats
         assert 'sanitized_count' in stats
         assert 'reduction_percent' in stats
-        
-        assert stats['original_count'] == len(SAMPLE_LOOP_CONVERSATION)
+
+        assert stats['original_count'] == len(sample_loop_conversation)
         assert stats['sanitized_count'] == len(sanitized)
         assert stats['total_removed'] == stats['original_count'] - stats['sanitized_count']